@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+"""
+Converte o log CSV dos sensores para Parquet (compressão ZSTD).
+
+Uso:
+    python converter_parquet.py [entrada.csv] [saida.parquet]
+
+O dashboard (prototipo_dashboard_agua.py) passa a ler data.parquet
+automaticamente quando o arquivo existe, dispensando o parsing do CSV
+a cada carga.
+"""
+
+import sys
+
+import pandas as pd
+
+ENTRADA = sys.argv[1] if len(sys.argv) > 1 else "data.csv"
+SAIDA = sys.argv[2] if len(sys.argv) > 2 else "data.parquet"
+
+
+TIMESTAMP_COL = "timestamp"
+
+
+def main():
+    df = pd.read_csv(ENTRADA)
+    # Converte o timestamp antes de gravar: o Parquet carrega um tipo de
+    # data de verdade e os leitores dispensam o pd.to_datetime por linha.
+    df[TIMESTAMP_COL] = pd.to_datetime(
+        df[TIMESTAMP_COL], format="%Y-%m-%d %H:%M:%S", errors="coerce"
+    )
+    df.to_parquet(SAIDA, compression="zstd", index=False)
+    print(f"{ENTRADA} → {SAIDA} ({len(df)} linhas)")
+
+
+if __name__ == "__main__":
+    main()
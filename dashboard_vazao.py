@@ -1,2 +1,113 @@
-429: Too Many Requests
-For more on scraping GitHub and how it may affect your rights, please review our Terms of Service (https://docs.github.com/en/site-policy/github-terms/github-terms-of-service).
\ No newline at end of file
+# -*- coding: utf-8 -*-
+"""
+AquaFlow – Visualizador do log de vazão coletado por get_data.py.
+
+Dashboard Streamlit simples: carrega a planilha gerada na captura serial
+(dados_vazao.xlsx ou CSV), mostra a série temporal de vazão, o volume
+agregado por hora e a tabela de leituras.
+
+Execução:
+    streamlit run dashboard_vazao.py
+"""
+
+import matplotlib.pyplot as plt
+import pandas as pd
+import streamlit as st
+
+from lttb import lttb_indices
+
+# Máximo de pontos desenhados na série temporal; acima disso o LTTB
+# reduz a série mantendo a mesma forma visual.
+MAX_PONTOS_PLOT = 2000
+
+st.set_page_config(page_title="AquaFlow – Vazão", page_icon="💧", layout="wide")
+
+
+@st.cache_resource
+def _figura(nome):
+    """Figura matplotlib criada uma vez e reutilizada entre reexecuções.
+
+    Cada rerun do Streamlit executava plt.subplots de novo e a figura
+    anterior ficava aberta (o matplotlib avisa com 20 figuras abertas);
+    aqui só limpamos os eixos e redesenhamos. `nome` é apenas a chave do
+    cache, uma figura por gráfico.
+    """
+    return plt.subplots(figsize=(10, 4))
+
+st.title("💧 AquaFlow – Monitor de Vazão")
+
+arquivo = st.file_uploader(
+    "Planilha de leituras (gerada por get_data.py)", type=["xlsx", "csv"]
+)
+
+if arquivo is None:
+    st.info("Envie a planilha de leituras para visualizar os dados.")
+    st.stop()
+
+if arquivo.name.endswith(".csv"):
+    df = pd.read_csv(arquivo)
+else:
+    df = pd.read_excel(arquivo)
+
+# Formato fixo gravado por get_data.py; declarar o formato evita a
+# inferência por linha do pandas (colunas já datetime passam direto).
+df["Timestamp"] = pd.to_datetime(
+    df["Timestamp"], format="%Y-%m-%d %H:%M:%S", cache=True
+)
+df = df.sort_values("Timestamp")
+
+if "Volume (L)" not in df.columns:
+    # Volume por amostra: vazão (L/s) integrada no intervalo entre leituras.
+    delta_s = df["Timestamp"].diff().dt.total_seconds().fillna(1)
+    df["Volume (L)"] = df["Vazão (L/s)"] * delta_s
+
+col1, col2, col3 = st.columns(3)
+col1.metric("Leituras", len(df))
+col2.metric("Volume total (L)", f"{df['Volume (L)'].sum():.2f}")
+col3.metric("Vazão média (L/min)", f"{df['Vazão (L/min)'].mean():.2f}")
+
+# Agregação por hora: com o Timestamp como índice, resample usa bordas de
+# hora monotônicas (varredura linear), sem materializar uma Series extra
+# com dt.floor nem agrupar por hash.
+df = df.set_index("Timestamp")
+df_hora = (
+    df.resample("1h")
+    .agg(
+        {
+            "Pulsos": "sum",
+            "Vazão (L/min)": "mean",
+            "Vazão (L/s)": "mean",
+            "Volume (L)": "sum",
+        }
+    )
+    .reset_index()
+    .rename(columns={"Timestamp": "Hora"})
+)
+
+st.subheader("Vazão ao longo do tempo")
+if len(df) > MAX_PONTOS_PLOT:
+    sel = lttb_indices(df.index.asi8, df["Vazão (L/s)"].values, MAX_PONTOS_PLOT)
+    df_plot = df.iloc[sel]
+else:
+    df_plot = df
+fig1, ax1 = _figura("serie")
+ax1.clear()
+ax1.plot(
+    df_plot.index, df_plot["Vazão (L/s)"], marker="o", markersize=2, color="#1f77b4"
+)
+ax1.set_xlabel("Horário")
+ax1.set_ylabel("Vazão (L/s)")
+ax1.grid(alpha=0.3)
+st.pyplot(fig1)
+
+st.subheader("Volume consumido por hora")
+fig2, ax2 = _figura("barras")
+ax2.clear()
+ax2.bar(df_hora["Hora"], df_hora["Volume (L)"], width=0.03, color="#2ca02c")
+ax2.set_xlabel("Hora")
+ax2.set_ylabel("Volume (L)")
+ax2.grid(alpha=0.3, axis="y")
+st.pyplot(fig2)
+
+st.subheader("Leituras recentes")
+st.dataframe(df.tail(200))
@@ -1,2 +1,99 @@
-429: Too Many Requests
-For more on scraping GitHub and how it may affect your rights, please review our Terms of Service (https://docs.github.com/en/site-policy/github-terms/github-terms-of-service).
\ No newline at end of file
+# -*- coding: utf-8 -*-
+"""
+AquaFlow – Captura das leituras do sensor de vazão via porta serial.
+
+Lê as linhas enviadas pelo ESP32 ("pulsos,vazao_l_min") e grava as
+amostras com timestamp em dados_vazao.csv, em modo append. As amostras
+são acumuladas em memória e gravadas em lote (a cada 100 amostras ou
+5 s, o que vier primeiro), mantendo a formatação e o IO fora do caminho
+crítico da leitura serial; uma queda de energia perde no máximo o lote
+ainda não gravado. Interrompa com Ctrl+C para encerrar.
+"""
+
+import csv
+import os
+import time
+from datetime import datetime
+
+import serial
+
+PORTA = "/dev/ttyUSB0"
+BAUDRATE = 115200
+ARQUIVO_SAIDA = "dados_vazao.csv"
+CABECALHO = ["Timestamp", "Pulsos", "Vazão (L/min)", "Vazão (L/s)"]
+
+# Amostras acumuladas em memória antes de formatar e gravar em lote.
+TAMANHO_LOTE = 100
+INTERVALO_FLUSH_S = 5.0
+
+escrever_cabecalho = (
+    not os.path.exists(ARQUIVO_SAIDA) or os.path.getsize(ARQUIVO_SAIDA) == 0
+)
+f = open(ARQUIVO_SAIDA, "a", newline="")
+writer = csv.writer(f)
+if escrever_cabecalho:
+    writer.writerow(CABECALHO)
+    f.flush()
+
+# No caminho crítico da leitura serial só guardamos o instante como
+# inteiro (time_ns); a formatação das strings de timestamp fica para o
+# momento do flush, amortizada sobre o lote inteiro.
+buffer = []
+
+
+def _descarregar():
+    if not buffer:
+        return
+    writer.writerows(
+        [
+            (
+                datetime.fromtimestamp(ns / 1e9).strftime("%Y-%m-%d %H:%M:%S"),
+                pulsos,
+                vazao_l_min,
+                vazao_l_s,
+            )
+            for ns, pulsos, vazao_l_min, vazao_l_s in buffer
+        ]
+    )
+    f.flush()
+    print(f"{len(buffer)} amostras gravadas em {ARQUIVO_SAIDA}")
+    buffer.clear()
+
+
+ser = serial.Serial(PORTA, BAUDRATE, timeout=2)
+print(f"Lendo {PORTA} @ {BAUDRATE}... (Ctrl+C para sair)")
+
+ultimo_flush = time.monotonic()
+try:
+    while True:
+        linha = ser.readline().decode("utf-8", errors="ignore").strip()
+
+        # Flush por tempo antes de qualquer filtro de linha: mesmo com a
+        # serial ociosa ou só emitindo linhas de debug, o que já está no
+        # buffer vai para o disco a cada INTERVALO_FLUSH_S.
+        agora = time.monotonic()
+        if buffer and agora - ultimo_flush >= INTERVALO_FLUSH_S:
+            _descarregar()
+            ultimo_flush = agora
+
+        if not linha:
+            continue
+        try:
+            pulsos_str, vazao_str = linha.split(",")
+            pulsos = int(pulsos_str)
+            vazao_l_min = float(vazao_str)
+        except ValueError:
+            # Linha de boot/debug do ESP32, ignora.
+            continue
+
+        buffer.append((time.time_ns(), pulsos, vazao_l_min, vazao_l_min / 60.0))
+        if len(buffer) >= TAMANHO_LOTE:
+            _descarregar()
+            ultimo_flush = agora
+except KeyboardInterrupt:
+    print("\nEncerrando captura...")
+finally:
+    _descarregar()
+    ser.close()
+    f.close()
+    print(f"Dados salvos em {ARQUIVO_SAIDA}")
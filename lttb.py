@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""
+Downsampling LTTB (Largest-Triangle-Three-Buckets) para séries temporais.
+
+Reduz uma série de N pontos para n_out pontos preservando a forma visual
+do gráfico: a série é dividida em baldes e, em cada balde, fica o ponto
+que forma o maior triângulo com o ponto escolhido anterior e a média do
+balde seguinte. Usado pelos dashboards para plotar no máximo ~2000
+pontos independentemente do tamanho do log.
+"""
+
+import numpy as np
+
+
+def lttb_indices(x, y, n_out):
+    """Devolve os índices dos pontos selecionados pelo LTTB.
+
+    `x` e `y` devem ser arrays 1-D do mesmo tamanho (x monotônico; para
+    timestamps use o array int64 de nanossegundos, ex.: `index.asi8`).
+    Se a série já tem até `n_out` pontos, devolve todos os índices.
+    """
+    x = np.asarray(x, dtype="f8")
+    y = np.asarray(y, dtype="f8")
+    n = x.size
+    if n_out >= n or n_out < 3:
+        return np.arange(n, dtype=np.intp)
+
+    # Bordas dos baldes intermediários (primeiro e último ponto são fixos).
+    bordas = np.linspace(1, n - 1, n_out - 1).astype(np.intp)
+    idx = np.empty(n_out, dtype=np.intp)
+    idx[0] = 0
+    idx[-1] = n - 1
+
+    a = 0  # último ponto selecionado
+    for i in range(n_out - 2):
+        lo = bordas[i]
+        hi = max(bordas[i + 1], lo + 1)
+        # Média do balde seguinte (o último "balde seguinte" é só o ponto final).
+        prox_lo = hi
+        prox_hi = bordas[i + 2] if i + 2 < n_out - 1 else n
+        prox_hi = max(prox_hi, prox_lo + 1)
+        mx = x[prox_lo:prox_hi].mean()
+        my = y[prox_lo:prox_hi].mean()
+
+        # Área (x2) do triângulo (a, candidato, média do próximo balde).
+        area = np.abs(
+            (x[a] - mx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (my - y[a])
+        )
+        a = lo + int(area.argmax())
+        idx[i + 1] = a
+    return idx
@@ -1,2 +1,475 @@
-429: Too Many Requests
-For more on scraping GitHub and how it may affect your rights, please review our Terms of Service (https://docs.github.com/en/site-policy/github-terms/github-terms-of-service).
\ No newline at end of file
+# -*- coding: utf-8 -*-
+"""
+AquaFlow – Dashboard de monitoramento de consumo de água (protótipo).
+
+Lê o log dos sensores de vazão (data.csv), calcula volume consumido,
+compara a entrada geral com a soma dos ramais para detectar vazamentos
+e exibe tudo em um dashboard Dash com atualização automática.
+"""
+
+import functools
+import os
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+
+import dash
+from dash import dcc, html, dash_table
+from dash.dependencies import Input, Output
+
+from lttb import lttb_indices
+
+try:
+    from numba import njit
+except ImportError:  # numba é opcional; sem ele o núcleo roda em NumPy puro
+    njit = None
+
+try:
+    import polars as pl
+except ImportError:  # polars é opcional; sem ele usamos o caminho pandas
+    pl = None
+
+# ---------------------------------------------------------------------------
+# Configuração
+# ---------------------------------------------------------------------------
+
+# Prefira o Parquet (gerado por converter_parquet.py) quando existir:
+# leitura colunar sem custo de tokenização do CSV.
+DATA_PATH = "data.parquet" if os.path.exists("data.parquet") else "data.csv"
+TIMESTAMP_COL = "timestamp"
+GENERAL_FLOW_COL = "vazao_geral_lpm"          # entrada geral, em L/min
+SENSOR_COLUMNS = [                            # ramais individuais, em L/s
+    "sensor_cozinha_lps",
+    "sensor_banheiro_lps",
+    "sensor_lavanderia_lps",
+    "sensor_jardim_lps",
+]
+
+# Diferença (L/s) entre entrada geral e soma dos ramais a partir da qual
+# consideramos possível vazamento.
+LEAK_THRESHOLD_LPS = 0.05
+
+# Posição aproximada de cada sensor na planta do imóvel (coordenadas 0-1).
+HOUSE_LAYOUT = {
+    "sensor_cozinha_lps": {"nome": "Cozinha", "x": 0.25, "y": 0.70},
+    "sensor_banheiro_lps": {"nome": "Banheiro", "x": 0.65, "y": 0.75},
+    "sensor_lavanderia_lps": {"nome": "Lavanderia", "x": 0.80, "y": 0.30},
+    "sensor_jardim_lps": {"nome": "Jardim", "x": 0.15, "y": 0.20},
+}
+
+# Tabela de posições já alinhada a SENSOR_COLUMNS, montada uma única vez.
+# Sensores sem posição cadastrada recebem um lugar fixo na borda inferior
+# da planta (determinístico, em vez de uma posição aleatória a cada tick).
+LAYOUT_DF = pd.DataFrame.from_dict(HOUSE_LAYOUT, orient="index").reindex(
+    SENSOR_COLUMNS
+)
+LAYOUT_DF["nome"] = LAYOUT_DF["nome"].fillna(
+    pd.Series(SENSOR_COLUMNS, index=SENSOR_COLUMNS)
+)
+_sem_posicao = LAYOUT_DF["x"].isna()
+if _sem_posicao.any():
+    LAYOUT_DF.loc[_sem_posicao, "x"] = np.linspace(0.1, 0.9, _sem_posicao.sum())
+    LAYOUT_DF.loc[_sem_posicao, "y"] = 0.05
+
+UPDATE_INTERVAL_MS = 5000
+
+# Máximo de pontos na série temporal; logs mais longos são reduzidos com
+# LTTB antes de montar a figura (mesma forma visual, payload muito menor).
+MAX_PONTOS_PLOT = 2000
+
+
+# ---------------------------------------------------------------------------
+# Carga e preparo dos dados
+# ---------------------------------------------------------------------------
+
+def load_data(path=DATA_PATH):
+    """Lê o log de leituras e devolve um DataFrame indexado pelo timestamp.
+
+    Aceita Parquet (leitura colunar, sem parsing) ou CSV. Para CSV, usa o
+    leitor multithread do PyArrow quando disponível, que evita criar um
+    objeto Python por célula; sem pyarrow instalado, cai no engine C padrão.
+    """
+    if path.endswith(".parquet"):
+        df = pd.read_parquet(path)
+    else:
+        try:
+            df = pd.read_csv(path, engine="pyarrow")
+        except (ImportError, ValueError):
+            df = pd.read_csv(path)
+    # Formato fixo gravado por get_data.py: declará-lo ativa o parser C
+    # rápido em vez da inferência de formato linha a linha.
+    df[TIMESTAMP_COL] = pd.to_datetime(
+        df[TIMESTAMP_COL], format="%Y-%m-%d %H:%M:%S", cache=True, errors="coerce"
+    )
+    df = df.dropna(subset=[TIMESTAMP_COL]).sort_values(TIMESTAMP_COL)
+    return df.set_index(TIMESTAMP_COL)
+
+
+def _nucleo_fluxo(geral_lpm, sensores, delta_s):
+    """Núcleo numérico do preprocess, operando só sobre arrays contíguos.
+
+    Escrito para ser compilável pelo numba (uma passada LLVM fundida, sem
+    o dispatch por operação do pandas); sem numba instalado, o mesmo corpo
+    roda como NumPy vetorizado normal.
+    """
+    # Constante tipada: sob numba, dividir float32 por um float Python
+    # promoveria o resultado a float64 (não há promoção fraca de escalar).
+    geral_lps = geral_lpm / np.float32(60.0)
+    soma_lps = sensores.sum(axis=1)
+    diff_lps = np.abs(geral_lps - soma_lps)
+    volume_l = geral_lps * delta_s
+    return geral_lps, soma_lps, diff_lps, volume_l
+
+
+if njit is not None:
+    _nucleo_fluxo = njit(cache=True, fastmath=True)(_nucleo_fluxo)
+
+
+def preprocess(df):
+    """Converte colunas para numérico e deriva vazões, volumes e diferenças."""
+    # float32 basta para a precisão dos sensores (~1e-3 L/s) e corta pela
+    # metade os bytes movidos em todas as reduções/agregações posteriores.
+    for col in [GENERAL_FLOW_COL] + SENSOR_COLUMNS:
+        df[col] = (
+            pd.to_numeric(df[col], errors="coerce").fillna(0).astype(np.float32)
+        )
+
+    # Intervalo entre leituras, para integrar vazão em volume. Uma subtração
+    # sobre o array datetime64 do índice, em vez do to_series().diff()
+    # .dt.total_seconds() do pandas (três passadas e duas Series temporárias).
+    # A primeira leitura recebe 1 s (papel do antigo fillna(1)).
+    ts_arr = df.index.values
+    delta_s = np.empty(len(ts_arr), dtype=np.float32)
+    delta_s[:1] = 1.0
+    delta_s[1:] = (ts_arr[1:] - ts_arr[:-1]) / np.timedelta64(1, "s")
+    df["delta_s"] = delta_s
+
+    geral_lps, soma_lps, diff_lps, volume_l = _nucleo_fluxo(
+        df[GENERAL_FLOW_COL].to_numpy(),
+        df[SENSOR_COLUMNS].to_numpy(),
+        df["delta_s"].to_numpy(),
+    )
+    # O núcleo deve preservar float32 tanto compilado (numba) quanto em
+    # NumPy puro; uma promoção silenciosa a float64 dobraria a banda de
+    # memória de todo o restante do pipeline.
+    assert geral_lps.dtype == np.float32 and volume_l.dtype == np.float32, (
+        geral_lps.dtype,
+        volume_l.dtype,
+    )
+    df["geral_lps"] = geral_lps
+    df["soma_sensores_lps"] = soma_lps
+    df["diff_lps"] = diff_lps
+    df["volume_geral_l"] = volume_l
+    return df
+
+
+def _load_processed_polars(path):
+    """Mesmo ETL de load_data + preprocess, executado pelo engine do Polars.
+
+    O scan preguiçoso deixa o planejador fundir as expressões aritméticas e
+    o parse do CSV roda multithread; a conversão para pandas no final é
+    zero-copy via Arrow, só para a fronteira com o Dash/Plotly.
+    """
+    parse_ts = pl.col(TIMESTAMP_COL).str.to_datetime(
+        "%Y-%m-%d %H:%M:%S", strict=False
+    )
+    if path.endswith(".parquet"):
+        lf = pl.scan_parquet(path)
+        # Parquets gravados antes do conversor tipar o timestamp trazem a
+        # coluna como string; nesse caso o parse também é necessário aqui.
+        if lf.collect_schema()[TIMESTAMP_COL] == pl.String:
+            lf = lf.with_columns(parse_ts)
+    else:
+        lf = pl.scan_csv(path).with_columns(parse_ts)
+    lf = (
+        lf.drop_nulls(TIMESTAMP_COL)
+        .sort(TIMESTAMP_COL)
+        .with_columns(
+            [
+                pl.col(c).cast(pl.Float32, strict=False).fill_null(0.0)
+                for c in [GENERAL_FLOW_COL] + SENSOR_COLUMNS
+            ]
+        )
+        .with_columns(
+            (pl.col(GENERAL_FLOW_COL) / 60.0).alias("geral_lps"),
+            pl.sum_horizontal(SENSOR_COLUMNS).alias("soma_sensores_lps"),
+            (pl.col(TIMESTAMP_COL).diff().dt.total_milliseconds() / 1000.0)
+            .fill_null(1.0)
+            .cast(pl.Float32)
+            .alias("delta_s"),
+        )
+        .with_columns(
+            (pl.col("geral_lps") - pl.col("soma_sensores_lps")).abs().alias("diff_lps"),
+            (pl.col("geral_lps") * pl.col("delta_s")).alias("volume_geral_l"),
+        )
+    )
+    return lf.collect().to_pandas().set_index(TIMESTAMP_COL)
+
+
+@functools.lru_cache(maxsize=4)
+def _load_processed_cached(path, mtime_ns, size):
+    """Carrega e processa o log; `mtime_ns` e `size` só compõem a chave."""
+    if pl is not None:
+        return _load_processed_polars(path)
+    return preprocess(load_data(path))
+
+
+def load_processed(path=DATA_PATH):
+    """Versão com cache de `load_data` + `preprocess`.
+
+    O resultado é função pura do conteúdo do arquivo, então usamos
+    (caminho, mtime, tamanho) como chave: enquanto o arquivo não muda,
+    os ticks do `dcc.Interval` reutilizam o DataFrame já processado em
+    vez de reler e recalcular tudo a cada 5 s. Qualquer gravação nova
+    altera mtime/tamanho e invalida a entrada naturalmente.
+    """
+    st = os.stat(path)
+    return _load_processed_cached(path, st.st_mtime_ns, st.st_size)
+
+
+# ---------------------------------------------------------------------------
+# Detecção de vazamentos
+# ---------------------------------------------------------------------------
+
+def _reduce_runs(values, starts, ends, ufunc):
+    """Aplica `ufunc.reduceat` apenas dentro de cada janela [start, end).
+
+    `reduceat` com índices intercalados devolve alternadamente a redução da
+    janela e a do intervalo entre janelas; descartamos esses intervalos.
+    """
+    idx = np.empty(starts.size + ends.size, dtype=np.intp)
+    idx[0::2] = starts
+    idx[1::2] = ends
+    # reduceat exige índices < len(values); a última janela pode terminar no fim.
+    if idx[-1] == len(values):
+        idx = idx[:-1]
+    return ufunc.reduceat(values, idx)[0::2]
+
+
+def detect_leaks(df, threshold_lps=LEAK_THRESHOLD_LPS):
+    """Identifica janelas contínuas de possível vazamento.
+
+    Um instante é suspeito quando a diferença entre a entrada geral e a soma
+    dos ramais excede o limiar, ou quando há fluxo geral com todos os ramais
+    zerados. A máscara booleana é calculada de uma vez e as janelas contínuas
+    são extraídas pelas transições 0→1 / 1→0, com as estatísticas por janela
+    agregadas via `reduceat` — sem nenhum laço Python sobre as linhas.
+    """
+    diff = df["diff_lps"].values
+    soma = df["soma_sensores_lps"].values
+    geral = df["geral_lps"].values
+    volume = df["volume_geral_l"].values
+
+    mask = (diff > threshold_lps) | ((soma == 0) & (geral > 0))
+    edges = np.flatnonzero(np.diff(np.r_[0, mask.view(np.int8), 0]))
+    starts, ends = edges[0::2], edges[1::2]
+
+    if starts.size == 0:
+        return pd.DataFrame(
+            columns=["inicio", "fim", "duracao_s", "pico_diff_lps", "volume_l"]
+        )
+
+    # Timestamps e duração direto do array datetime64 subjacente, sem passar
+    # por indexação de DatetimeIndex/TimedeltaIndex do pandas. A divisão por
+    # timedelta64(1, 's') respeita a unidade do índice (ns ou us).
+    ts = df.index.values
+    inicio = ts[starts]
+    fim = ts[ends - 1]
+    return pd.DataFrame(
+        {
+            "inicio": inicio,
+            "fim": fim,
+            "duracao_s": (fim - inicio) / np.timedelta64(1, "s"),
+            "pico_diff_lps": _reduce_runs(diff, starts, ends, np.maximum),
+            "volume_l": _reduce_runs(volume, starts, ends, np.add),
+        }
+    )
+
+
+def aggregate_period(df, freq="1h"):
+    """Agrega o log por período (hora, por padrão) para os gráficos."""
+    return df.resample(freq).agg(
+        {"volume_geral_l": "sum", "geral_lps": "mean", "diff_lps": "max"}
+    )
+
+
+def _arredonda_exibicao(df, casas=3):
+    """Arredonda um DataFrame para exibição nas DataTables.
+
+    Colunas float32 voltam a float64 antes do round: arredondar float32
+    guarda apenas o float32 mais próximo do valor arredondado, e a tabela
+    renderizaria todos os dígitos (0.699999988079071 em vez de 0.7).
+    """
+    colunas_f32 = df.select_dtypes(np.float32).columns
+    if len(colunas_f32):
+        df = df.astype(dict.fromkeys(colunas_f32, "float64"))
+    return df.round(casas)
+
+
+# ---------------------------------------------------------------------------
+# Layout
+# ---------------------------------------------------------------------------
+
+# Com diskcache instalado, o callback pesado roda em background (fora da
+# thread que atende as requisições); sem ele, cai no callback síncrono.
+try:
+    import diskcache
+
+    from dash import DiskcacheManager
+
+    _gerenciador_bg = DiskcacheManager(diskcache.Cache("./.cache"))
+    CALLBACK_BACKGROUND = {
+        "background": True,
+        "manager": _gerenciador_bg,
+        # Desabilita o Interval enquanto uma execução está em andamento;
+        # sem isso, quando o processamento fica mais lento que os 5 s os
+        # ticks enfileirariam jobs no diskcache sem limite.
+        "running": [(Output("intervalo", "disabled"), True, False)],
+    }
+except ImportError:
+    CALLBACK_BACKGROUND = {}
+
+app = dash.Dash(__name__, title="AquaFlow")
+
+app.layout = html.Div(
+    [
+        html.H2("💧 AquaFlow – Monitoramento de Consumo de Água"),
+        html.Div(
+            [
+                html.Div(
+                    [html.H4("Hoje"), html.H3(id="total-hoje")],
+                    className="card",
+                ),
+                html.Div(
+                    [html.H4("Últimos 7 dias"), html.H3(id="total-semana")],
+                    className="card",
+                ),
+                html.Div(
+                    [html.H4("Últimos 30 dias"), html.H3(id="total-mes")],
+                    className="card",
+                ),
+            ],
+            style={"display": "flex", "gap": "16px"},
+        ),
+        dcc.Graph(id="grafico-serie"),
+        html.Div(
+            [
+                dcc.Graph(id="grafico-barras", style={"flex": 1}),
+                dcc.Graph(id="grafico-heatmap", style={"flex": 1}),
+            ],
+            style={"display": "flex"},
+        ),
+        html.H4("⚠️ Alertas de vazamento"),
+        dash_table.DataTable(id="tabela-alertas", page_size=5),
+        html.H4("Leituras recentes"),
+        dash_table.DataTable(id="tabela-dados", page_size=10),
+        dcc.Interval(id="intervalo", interval=UPDATE_INTERVAL_MS),
+    ]
+)
+
+
+# ---------------------------------------------------------------------------
+# Callback principal
+# ---------------------------------------------------------------------------
+
+@app.callback(
+    Output("total-hoje", "children"),
+    Output("total-semana", "children"),
+    Output("total-mes", "children"),
+    Output("grafico-serie", "figure"),
+    Output("grafico-barras", "figure"),
+    Output("grafico-heatmap", "figure"),
+    Output("tabela-alertas", "data"),
+    Output("tabela-dados", "data"),
+    Input("intervalo", "n_intervals"),
+    **CALLBACK_BACKGROUND,
+)
+def update_all(_n):
+    df = load_processed()
+
+    # Totais de hoje/semana/mês: o índice já é ordenado, então basta achar
+    # os pontos de corte com busca binária e somar fatias do array contíguo
+    # de volumes — uma passada, sem criar três DataFrames filtrados.
+    agora = df.index.max()
+    vols = df["volume_geral_l"].values
+    corte_mes, corte_semana, corte_hoje = df.index.searchsorted(
+        [agora - timedelta(days=30), agora - timedelta(days=7), agora.normalize()]
+    )
+    total_mes = vols[corte_mes:].sum()
+    total_semana = vols[corte_semana:].sum()
+    total_hoje = vols[corte_hoje:].sum()
+
+    # Série temporal do volume por hora
+    agg_hour = aggregate_period(df)
+    if len(agg_hour) > MAX_PONTOS_PLOT:
+        sel = lttb_indices(
+            agg_hour.index.asi8, agg_hour["volume_geral_l"].values, MAX_PONTOS_PLOT
+        )
+        agg_hour = agg_hour.iloc[sel]
+    # px aceita o índice diretamente como eixo x, sem cópia via reset_index.
+    fig_ts = px.line(
+        agg_hour,
+        x=agg_hour.index,
+        y="volume_geral_l",
+        title="Volume consumido por hora",
+        labels={"volume_geral_l": "Volume (L)", TIMESTAMP_COL: "Hora"},
+    )
+
+    # Total acumulado por sensor, calculado uma vez e usado nas duas figuras.
+    sensor_sums = df[SENSOR_COLUMNS].sum()
+
+    # Consumo acumulado por sensor
+    sums = sensor_sums.rename_axis("sensor").reset_index(name="total_l")
+    fig_bar = px.bar(
+        sums, x="sensor", y="total_l", title="Consumo acumulado por sensor"
+    )
+
+    # Mapa de calor sobre a planta do imóvel
+    heat_df = LAYOUT_DF.assign(valor=sensor_sums.reindex(SENSOR_COLUMNS).values)
+    fig_heat = px.scatter(
+        heat_df,
+        x="x",
+        y="y",
+        size="valor",
+        color="valor",
+        text="nome",
+        title="Intensidade de consumo por ponto",
+        range_x=[0, 1],
+        range_y=[0, 1],
+        color_continuous_scale="Blues",
+    )
+    fig_heat.update_traces(textposition="top center")
+
+    # Alertas de vazamento, com severidade pelo pico da diferença
+    alerts = detect_leaks(df)
+    if not alerts.empty:
+        alerts["severidade"] = pd.cut(
+            alerts["pico_diff_lps"],
+            bins=[0, 2 * LEAK_THRESHOLD_LPS, 5 * LEAK_THRESHOLD_LPS, np.inf],
+            labels=["Leve", "Médio", "Crítico"],
+        )
+        alerts["inicio"] = alerts["inicio"].dt.strftime("%d/%m %H:%M:%S")
+        alerts["fim"] = alerts["fim"].dt.strftime("%d/%m %H:%M:%S")
+    # Volta para float64 antes do round: arredondar float32 guarda o
+    # float32 mais próximo e a tabela renderia 0.699999988079071.
+    alert_data = _arredonda_exibicao(alerts).to_dict("records")
+
+    # tail antes do reset_index: copia só as 200 linhas exibidas, não o log todo.
+    raw_data = _arredonda_exibicao(df.tail(200).reset_index()).to_dict("records")
+
+    return (
+        f"{total_hoje:.1f} L",
+        f"{total_semana:.1f} L",
+        f"{total_mes:.1f} L",
+        fig_ts,
+        fig_bar,
+        fig_heat,
+        alert_data,
+        raw_data,
+    )
+
+
+if __name__ == "__main__":
+    app.run(debug=True)
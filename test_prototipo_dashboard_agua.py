@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""
+Testes do carregamento/processamento do dashboard (prototipo_dashboard_agua).
+
+Cobrem o caminho Polars do loader contra o caminho pandas de referência,
+nos três formatos de entrada: CSV, Parquet com timestamp tipado (saída do
+converter_parquet.py atual) e Parquet antigo com o timestamp como string.
+
+Execução:
+    python -m pytest test_prototipo_dashboard_agua.py
+"""
+
+import importlib.util
+import sys
+import types
+import unittest.mock as mock
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pl = pytest.importorskip("polars")
+
+COLUNAS_DERIVADAS = [
+    "geral_lps",
+    "soma_sensores_lps",
+    "diff_lps",
+    "delta_s",
+    "volume_geral_l",
+]
+
+
+@pytest.fixture(scope="module")
+def proto():
+    """Importa o módulo do dashboard com stubs de dash/plotly.
+
+    Só o pipeline de dados é exercitado aqui; o app Dash em si não
+    precisa (nem pode, sem as dependências de interface) ser criado.
+    """
+    for nome in ("plotly", "dash", "dash.dependencies"):
+        sys.modules.setdefault(nome, types.ModuleType(nome))
+    sys.modules["plotly.express"] = mock.MagicMock()
+    dash = sys.modules["dash"]
+    dash.Dash = lambda *args, **kwargs: mock.MagicMock()
+    dash.dcc = mock.MagicMock()
+    dash.html = mock.MagicMock()
+    dash.dash_table = mock.MagicMock()
+    sys.modules["dash.dependencies"].Input = mock.MagicMock()
+    sys.modules["dash.dependencies"].Output = mock.MagicMock()
+
+    caminho = Path(__file__).with_name("prototipo_dashboard_agua.py")
+    spec = importlib.util.spec_from_file_location("prototipo_dashboard_agua", caminho)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+@pytest.fixture()
+def log_bruto(proto):
+    """Log sintético no formato gravado por get_data.py (timestamp string)."""
+    n = 200
+    rng = np.random.default_rng(42)
+    df = pd.DataFrame(
+        {
+            proto.TIMESTAMP_COL: pd.date_range(
+                "2025-11-01", periods=n, freq="5s"
+            ).strftime("%Y-%m-%d %H:%M:%S"),
+            proto.GENERAL_FLOW_COL: rng.random(n) * 60,
+        }
+    )
+    for col in proto.SENSOR_COLUMNS:
+        df[col] = rng.random(n) * 0.2
+    return df
+
+
+def _confere_contra_pandas(proto, saida, log_bruto, tmp_path):
+    """Compara uma saída do loader Polars com o caminho pandas de referência."""
+    caminho_csv = tmp_path / "referencia.csv"
+    log_bruto.to_csv(caminho_csv, index=False)
+    referencia = proto.preprocess(proto.load_data(str(caminho_csv)))
+    assert (saida.index == referencia.index).all()
+    for col in COLUNAS_DERIVADAS:
+        # atol na escala do epsilon de float32: os dois engines arredondam
+        # em ordens diferentes, a diferença fica em ~1e-7.
+        assert np.allclose(
+            saida[col].values, referencia[col].values, rtol=1e-5, atol=1e-6
+        ), col
+
+
+def test_polars_csv(proto, log_bruto, tmp_path):
+    caminho = tmp_path / "data.csv"
+    log_bruto.to_csv(caminho, index=False)
+    saida = proto._load_processed_polars(str(caminho))
+    _confere_contra_pandas(proto, saida, log_bruto, tmp_path)
+
+
+def test_polars_parquet_timestamp_tipado(proto, log_bruto, tmp_path):
+    df = log_bruto.copy()
+    df[proto.TIMESTAMP_COL] = pd.to_datetime(
+        df[proto.TIMESTAMP_COL], format="%Y-%m-%d %H:%M:%S"
+    )
+    caminho = tmp_path / "data.parquet"
+    df.to_parquet(caminho, index=False)
+    saida = proto._load_processed_polars(str(caminho))
+    _confere_contra_pandas(proto, saida, log_bruto, tmp_path)
+
+
+def test_preprocess_mantem_float32(proto, log_bruto, tmp_path):
+    # Vale para o caminho NumPy puro e, com numba instalado, para o kernel
+    # compilado — que sem constantes tipadas promoveria tudo a float64.
+    caminho = tmp_path / "data.csv"
+    log_bruto.to_csv(caminho, index=False)
+    saida = proto.preprocess(proto.load_data(str(caminho)))
+    for col in COLUNAS_DERIVADAS + proto.SENSOR_COLUMNS:
+        assert saida[col].dtype == np.float32, (col, saida[col].dtype)
+
+
+def test_polars_parquet_timestamp_string(proto, log_bruto, tmp_path):
+    # Parquet gerado por versões antigas do conversor: coluna ainda string.
+    caminho = tmp_path / "data.parquet"
+    log_bruto.to_parquet(caminho, index=False)
+    saida = proto._load_processed_polars(str(caminho))
+    _confere_contra_pandas(proto, saida, log_bruto, tmp_path)